@@ -4,14 +4,66 @@ Demo script showing how to use the Reddit Market Research Framework
 with different product concepts.
 """
 
+import ast
 import os
 import sys
-from dotenv import load_dotenv
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11; TOML configs then need the tomli package
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "results")
 CONFIG_DIR = os.getenv("CONFIG_DIR", "config")
 
 
+def read_config_literals(config_file: str, names: tuple[str, ...]) -> dict:
+    """
+    Read literal top-level assignments from a config file without running it.
+
+    TOML files are parsed with tomllib; Python files are parsed with ast and
+    only their literal assignments are read.
+
+    Args:
+        config_file: Path to the concept configuration file
+        names: Names of the assignments to read
+
+    Returns:
+        Dictionary of name to value
+    """
+    if config_file.endswith(".toml"):
+        if tomllib is None:
+            raise ImportError(
+                f"Loading {config_file} needs Python 3.11+ or the tomli package"
+            )
+        with open(config_file, "rb") as f:
+            config = tomllib.load(f)
+        values = {name: config[name] for name in names if name in config}
+    else:
+        with open(config_file, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=config_file)
+
+        values = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                targets = [node.target]
+            else:
+                continue
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id in names:
+                    values[target.id] = ast.literal_eval(node.value)
+
+    missing = [name for name in names if name not in values]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} not defined in {config_file}")
+    return values
+
+
 def demo_concept_switching():
     """Demonstrate how easy it is to switch between different product concepts."""
 
@@ -31,6 +83,7 @@ def demo_concept_switching():
     concepts = {
         f"{CONFIG_DIR}/example_finance_config.py": "AI-Powered Personal Finance Advisor",
         f"{CONFIG_DIR}/example_smarthome_config.py": "Family-Focused Smart Home Automation",
+        f"{CONFIG_DIR}/example_finance_config.toml": "AI-Powered Personal Finance Advisor (TOML)",
     }
 
     for i, (config_file, description) in enumerate(concepts.items(), 1):
@@ -40,19 +93,15 @@ def demo_concept_switching():
 
             # Load and show key details
             try:
-                import importlib.util
-
-                spec = importlib.util.spec_from_file_location("config", config_file)
-                if spec is not None and spec.loader is not None:
-                    config = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(config)
-                else:
-                    raise ImportError(f"Could not load spec for {config_file}")
+                config = read_config_literals(
+                    config_file, ("TARGET_SUBREDDITS", "KEYWORDS")
+                )
+                subreddits = config["TARGET_SUBREDDITS"]
 
                 print(
-                    f"   Subreddits: {', '.join(config.TARGET_SUBREDDITS[:3])}{'...' if len(config.TARGET_SUBREDDITS) > 3 else ''}"
+                    f"   Subreddits: {', '.join(subreddits[:3])}{'...' if len(subreddits) > 3 else ''}"
                 )
-                print(f"   Keywords: {len(config.KEYWORDS)} terms")
+                print(f"   Keywords: {len(config['KEYWORDS'])} terms")
                 print()
             except Exception as e:
                 print(f"   (Error loading config: {e})")
@@ -110,6 +159,7 @@ def show_file_structure():
             [
                 "config/example_finance_config.py - Personal finance app",
                 "config/example_smarthome_config.py - Smart home for families",
+                "config/example_finance_config.toml - Personal finance app, as TOML",
             ],
         ),
         (
@@ -134,6 +184,9 @@ def show_file_structure():
 
 def main():
     """Main demo function."""
+    # Imported here so importing this module does not pull in dotenv
+    from dotenv import load_dotenv
+
     load_dotenv()
     if len(sys.argv) > 1 and sys.argv[1] == "--structure":
         show_file_structure()
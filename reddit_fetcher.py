@@ -1,9 +1,22 @@
 """Reddit data fetching for market research."""
 
+import heapq
+import operator
 import praw
+import queue
+import sys
+import threading
 import time
-from praw.models import Comment, Submission
-from utils import Settings, Config, FileManager, TextProcessor
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from praw.models import Comment, MoreComments, Submission
+from praw.models.comment_forest import CommentForest
+from utils import Settings, Config, FileManager, TextProcessor, RateLimiter
+
+_REDDIT_BASE = "https://reddit.com"
+
+# Sort key for comments, evaluated in C rather than through a lambda
+_by_score = operator.attrgetter("score")
 
 
 class RedditFetcher:
@@ -21,8 +34,23 @@ class RedditFetcher:
         self.settings = settings
         self.text_processor = TextProcessor()
         self.file_manager = FileManager()
-        self.reddit = self._init_reddit_client()
-        self.all_threads = {}
+        self.seen_ids = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        # Comment fetches from all worker threads share one request budget,
+        # paced by REDDIT_REQUEST_DELAY until Reddit reports its own limits
+        delay = self.settings.reddit_request_delay
+        self.rate_limiter = RateLimiter(1 / delay if delay > 0 else 0)
+
+    @property
+    def reddit(self) -> praw.Reddit:
+        """Reddit client for the current thread, since PRAW is not thread safe."""
+        reddit = getattr(self._local, "reddit", None)
+        if reddit is None:
+            reddit = self._init_reddit_client()
+            self._local.reddit = reddit
+        return reddit
 
     def _init_reddit_client(self) -> praw.Reddit:
         """Initialize Reddit client with credentials."""
@@ -34,81 +62,173 @@ class RedditFetcher:
 
     def fetch_replies(self, comment: Comment, current_depth: int = 0) -> list[dict]:
         """
-        Recursively fetch replies up to a certain depth.
+        Fetch replies up to a certain depth.
+
+        The reply tree is walked with an explicit stack rather than recursion,
+        so deep threads cost no extra Python frames.
 
         Args:
             comment: Comment to fetch replies for
-            current_depth: Current recursion depth
+            current_depth: Depth of the comment in the reply tree
 
         Returns:
             List of reply data dictionaries
         """
-        if current_depth >= self.settings.reply_fetch_depth:
-            return []
-
         replies_data = []
-        comment.replies.replace_more(limit=0)  # Expand only the first level of "more"
-        sorted_replies = sorted(
-            comment.replies.list(),
-            key=lambda r: r.score if isinstance(r, Comment) else 0,
-            reverse=True,
-        )
+        stack = [(comment, replies_data, current_depth)]
+
+        while stack:
+            parent, parent_replies, depth = stack.pop()
+            if depth >= self.settings.reply_fetch_depth:
+                continue
+
+            # Expand only the first level of "more"
+            parent.replies.replace_more(limit=0)
+            # Only direct replies; deeper ones are reached by the next level.
+            # PRAW never subclasses Comment, so an exact type check is enough
+            # to drop the remaining "more" stubs.
+            top_replies = heapq.nlargest(
+                self.settings.max_replies_per_comment,
+                [r for r in parent.replies if type(r) is Comment],
+                key=_by_score,
+            )
+
+            children = []
+            for reply in top_replies:
+                reply_dict = {
+                    "id": reply.id,
+                    "body": reply.body,
+                    "author": self._author_name(reply),
+                    "score": reply.score,
+                    "created_utc": reply.created_utc,
+                    "replies": [],
+                }
+                parent_replies.append(reply_dict)
+                children.append((reply, reply_dict["replies"], depth + 1))
+
+            # Push in reverse so replies are expanded in their sorted order
+            stack.extend(reversed(children))
 
-        for reply in sorted_replies[: self.settings.max_replies_per_comment]:
-            if isinstance(reply, Comment):
-                replies_data.append(
-                    {
-                        "id": reply.id,
-                        "body": reply.body,
-                        "author": str(reply.author),
-                        "score": reply.score,
-                        "created_utc": reply.created_utc,
-                        "replies": self.fetch_replies(reply, current_depth + 1),
-                    }
-                )
         return replies_data
 
-    def process_submission(self, submission: Submission, sub_name: str) -> None:
+    def _adapt_rate_limit(self) -> None:
+        """
+        Spread the request budget Reddit reports evenly over what is left of
+        the current rate-limit window.
+
+        The limiter is charged once per comment request: the initial load of
+        each post and each "load more" expansion. Search and listing requests
+        are left to prawcore's own rate-limit handling.
+        """
+        limits = self.reddit.auth.limits
+        remaining = limits.get("remaining")
+        reset_timestamp = limits.get("reset_timestamp")
+        if remaining is None or reset_timestamp is None:
+            return
+
+        seconds_left = reset_timestamp - time.time()
+        if seconds_left > 0:
+            self.rate_limiter.set_rate(max(remaining, 1) / seconds_left)
+
+    @staticmethod
+    def _author_name(comment: Comment) -> str:
+        """
+        Return a comment author's name, or "[deleted]" if the account is gone.
+
+        Names are interned, since prolific commenters appear many times over
+        and each comment would otherwise carry its own copy of the string.
+        """
+        return sys.intern(
+            "[deleted]" if comment.author is None else comment.author.name
+        )
+
+    def _claim_submission(self, submission_id: str) -> bool:
+        """
+        Claim a post for processing unless another search already found it.
+
+        Args:
+            submission_id: Reddit submission ID
+
+        Returns:
+            True if the post had not been seen before
+        """
+        with self._lock:
+            if submission_id in self.seen_ids:
+                return False
+            self.seen_ids.add(submission_id)
+            return True
+
+    def process_submission(self, submission: Submission, sub_name: str) -> dict:
         """
         Process a single submission, fetching its comments and replies.
 
         Args:
             submission: Reddit submission object
             sub_name: Subreddit name
-        """
-        # Skip if we've already processed this post from a different keyword search
-        if submission.id in self.all_threads:
-            return
 
+        Returns:
+            Thread data dictionary
+        """
         comments_data = []
 
+        self.rate_limiter.acquire()
         try:
-            submission.comments.replace_more(
-                limit=self.settings.reddit_more_comments_limit
-            )
+            # Load comments through this thread's own client, since the
+            # submission may have been listed by another worker thread
+            loaded = self.reddit.submission(id=submission.id)
+            comment_forest = loaded.comments
 
-            # Sort comments by score (upvotes) to get the most relevant ones
-            sorted_comments = sorted(
-                submission.comments.list(),
-                key=lambda c: c.score if isinstance(c, Comment) else 0,
-                reverse=True,
+            # Top-level "load more" stubs hold the lower ranked remainder of
+            # the thread and each one costs a request to expand. They are
+            # expanded one at a time, largest first, only until the top level
+            # has enough comments to fill the per-post limit or the budget runs
+            # out. Each stub goes through a forest of its own, since
+            # replace_more on the whole forest drops every stub it does not
+            # expand. Stubs deeper in the tree are left alone.
+            top_level = [c for c in comment_forest if type(c) is Comment]
+            stubs = [c for c in comment_forest if type(c) is MoreComments]
+            heapq.heapify(stubs)  # MoreComments order largest count first
+            budget = self.settings.reddit_more_comments_limit
+            while (
+                stubs
+                and budget > 0
+                and len(top_level) < self.settings.comment_limit_per_post
+            ):
+                budget -= 1
+                self.rate_limiter.acquire()
+                expanded = CommentForest(loaded, [heapq.heappop(stubs)])
+                for stub in expanded.replace_more(limit=1):
+                    # A stub for the rest of the top level, as opposed to one
+                    # for the replies of a comment just loaded
+                    if stub.parent_id == loaded.fullname:
+                        heapq.heappush(stubs, stub)
+                top_level.extend(c for c in expanded if type(c) is Comment)
+
+            # Take the highest scoring (most upvoted) top-level comments. The
+            # flattened forest would also pick up replies, which are then
+            # fetched a second time under their parent.
+            top_comments = heapq.nlargest(
+                self.settings.comment_limit_per_post,
+                top_level,
+                key=_by_score,
             )
 
-            for comment in sorted_comments[: self.settings.comment_limit_per_post]:
-                if isinstance(comment, Comment):
-                    comment_dict = {
-                        "id": comment.id,
-                        "body": comment.body,
-                        "author": str(comment.author),
-                        "score": comment.score,
-                        "created_utc": comment.created_utc,
-                        "replies": self.fetch_replies(comment, current_depth=0),
-                    }
-                    comments_data.append(comment_dict)
+            for comment in top_comments:
+                comment_dict = {
+                    "id": comment.id,
+                    "body": comment.body,
+                    "author": self._author_name(comment),
+                    "score": comment.score,
+                    "created_utc": comment.created_utc,
+                    "replies": self.fetch_replies(comment, current_depth=0),
+                }
+                comments_data.append(comment_dict)
+
+            self._adapt_rate_limit()
         except Exception as e:
             print(f"      Error fetching comments for post {submission.id}: {e}")
 
-        self.all_threads[submission.id] = {
+        thread = {
             "id": submission.id,
             "title": submission.title,
             "selftext": submission.selftext,
@@ -117,56 +237,105 @@ class RedditFetcher:
             "score": submission.score,
             "num_comments": submission.num_comments,
             "created_utc": submission.created_utc,
-            "permalink": f"https://reddit.com{submission.permalink}",
+            "permalink": _REDDIT_BASE + submission.permalink,
             "comments": comments_data,
         }
+        return thread
 
-    def fetch_keyword_threads(self) -> None:
-        """Fetch posts based on keywords from target subreddits."""
-        for sub_name in self.config.target_subreddits:
-            subreddit = self.reddit.subreddit(sub_name)
-            for keyword in self.config.keywords:
-                print(f"\nSearching for '{keyword}' in r/{sub_name}...")
-                try:
-                    for submission in subreddit.search(
-                        keyword, limit=self.settings.post_limit_per_query
-                    ):
-                        self.process_submission(submission, sub_name)
-                        time.sleep(self.settings.reddit_request_delay)
-                except Exception as e:
-                    print(f"    An error occurred while searching in r/{sub_name}: {e}")
-                    time.sleep(5)  # Wait a bit if there's a broader issue
+    def search_subreddit(
+        self, sub_name: str, keyword: str
+    ) -> list[tuple[Submission, str]]:
+        """
+        Search a subreddit for a keyword.
 
-    def fetch_top_threads(self, time_filters=["all", "year"]) -> None:
+        Args:
+            sub_name: Subreddit name
+            keyword: Search query
+
+        Returns:
+            List of (submission, subreddit name) tuples for posts not seen before
+        """
+        print(f"\nSearching for '{keyword}' in r/{sub_name}...")
+        subreddit = self.reddit.subreddit(sub_name)
+        submissions = []
+        try:
+            for submission in subreddit.search(
+                keyword, limit=self.settings.post_limit_per_query
+            ):
+                if self._claim_submission(submission.id):
+                    submissions.append((submission, sub_name))
+        except Exception as e:
+            print(f"    An error occurred while searching in r/{sub_name}: {e}")
+            time.sleep(5)  # Wait a bit if there's a broader issue
+        return submissions
+
+    def fetch_subreddit_top(
+        self, subreddit_name: str, time_filter: str
+    ) -> list[tuple[Submission, str]]:
         """
-        Fetch top posts from subreddits based on time filter.
+        Fetch the top posts of a subreddit for one time filter.
 
         Args:
-            time_filters: List of time filters to use
-            limit: Number of posts to fetch per time filter
+            subreddit_name: Subreddit name
+            time_filter: Time filter to use (e.g. "all", "year")
+
+        Returns:
+            List of (submission, subreddit name) tuples for posts not seen before
         """
-        for subreddit_name in self.config.target_subreddits:
-            subreddit = self.reddit.subreddit(subreddit_name)
-            for time_filter in time_filters:
-                print(f"Fetching top posts from r/{subreddit_name} ({time_filter})...")
-                try:
-                    for submission in subreddit.top(
-                        time_filter=time_filter, limit=self.settings.top_posts_count
-                    ):
-                        self.process_submission(submission, subreddit_name)
-                        time.sleep(self.settings.reddit_request_delay)
-                except Exception as e:
-                    print(
-                        f"    An error occurred while fetching top posts from r/{subreddit_name}: {e}"
-                    )
-                    time.sleep(5)
-
-    def fetch_all_data(self) -> list[dict]:
+        print(f"Fetching top posts from r/{subreddit_name} ({time_filter})...")
+        subreddit = self.reddit.subreddit(subreddit_name)
+        submissions = []
+        try:
+            for submission in subreddit.top(
+                time_filter=time_filter, limit=self.settings.top_posts_count
+            ):
+                if self._claim_submission(submission.id):
+                    submissions.append((submission, subreddit_name))
+        except Exception as e:
+            print(
+                f"    An error occurred while fetching top posts from r/{subreddit_name}: {e}"
+            )
+            time.sleep(5)
+        return submissions
+
+    def _listing_tasks(self, time_filters: list[str]) -> list[tuple]:
         """
-        Main method to fetch all Reddit data.
+        Build the listing requests: keyword searches, then top posts.
+
+        Args:
+            time_filters: List of time filters to fetch top posts for
 
         Returns:
-            List of thread data dictionaries
+            List of (listing method, subreddit name, query) tuples
+        """
+        # dict.fromkeys drops duplicate entries while keeping config order
+        subreddits = dict.fromkeys(self.config.target_subreddits)
+        keywords = dict.fromkeys(self.config.keywords)
+        return [
+            (self.search_subreddit, sub_name, keyword)
+            for sub_name in subreddits
+            for keyword in keywords
+        ] + [
+            (self.fetch_subreddit_top, sub_name, time_filter)
+            for sub_name in subreddits
+            for time_filter in time_filters
+        ]
+
+    def iter_threads(self, time_filters=["all", "year"]) -> Iterator[dict]:
+        """
+        Fetch all Reddit data, yielding each thread once its comments load.
+
+        Listings are fetched on one thread pool; as each completes, its new
+        posts are handed to a second pool that fetches their comments, so
+        comment fetching starts while other listings are still loading.
+        Threads are yielded in the order they finish and are not kept, so a
+        caller writing them out never holds the whole fetch in memory.
+
+        Args:
+            time_filters: List of time filters to fetch top posts for
+
+        Yields:
+            Thread data dictionaries
         """
         print(
             f"Starting Reddit data collection for concept: {self.config.concept_name}"
@@ -175,8 +344,52 @@ class RedditFetcher:
         print(f"Target subreddits: {self.config.target_subreddits}")
         print(f"Keywords: {len(self.config.keywords)} keywords")
 
-        self.fetch_keyword_threads()
-        self.fetch_top_threads()
+        workers = self.settings.fetch_workers
+        thread_count = 0
+        # Every listing and thread future is put on this queue when it finishes
+        finished = queue.Queue()
+        with ThreadPoolExecutor(max_workers=workers) as listing_executor:
+            with ThreadPoolExecutor(max_workers=workers) as comment_executor:
+                try:
+                    listing_futures = set()
+                    for task in self._listing_tasks(time_filters):
+                        listing_future = listing_executor.submit(*task)
+                        listing_future.add_done_callback(finished.put)
+                        listing_futures.add(listing_future)
+
+                    pending = len(listing_futures)
+                    while pending:
+                        future = finished.get()
+                        pending -= 1
+                        if future not in listing_futures:
+                            thread_count += 1
+                            yield future.result()
+                            continue
+
+                        listing_futures.discard(future)
+                        for submission, sub_name in future.result():
+                            thread_future = comment_executor.submit(
+                                self.process_submission, submission, sub_name
+                            )
+                            thread_future.add_done_callback(finished.put)
+                            pending += 1
+                finally:
+                    # After Ctrl-C or the caller closing the generator, e.g.
+                    # when writing a thread failed, drop queued listings and
+                    # comment fetches instead of waiting for them all
+                    listing_executor.shutdown(wait=False, cancel_futures=True)
+                    comment_executor.shutdown(cancel_futures=True)
 
-        print(f"Total unique posts: {len(self.all_threads)}")
-        return list(self.all_threads.values())
+        print(f"Total unique posts: {thread_count}")
+
+    def fetch_all_data(self, time_filters=["all", "year"]) -> list[dict]:
+        """
+        Main method to fetch all Reddit data.
+
+        Args:
+            time_filters: List of time filters to fetch top posts for
+
+        Returns:
+            List of thread data dictionaries
+        """
+        return list(self.iter_threads(time_filters))
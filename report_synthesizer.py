@@ -1,6 +1,101 @@
 """Report synthesis from LLM analysis results."""
 
-from utils import FileManager, Config, LLMClient
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from utils import FileManager, Config, LLMClient, LLMStreamError, TextProcessor
+
+# Thematic analysis prompts are the same for every category, so they are built
+# once here and only the item list is filled in per call
+_THEMATIC_SYSTEM_PROMPT = "You are a data analyst specializing in qualitative data. Your task is to perform thematic analysis on a list of user-provided items, group them into high-level categories, and count the occurrences for each category."
+
+_THEMATIC_USER_PROMPT_TEMPLATE = """
+Analyze the following list of raw '{item_description}'. Group similar items into meaningful, high-level themes.
+
+For each theme, provide:
+1. A concise `theme_name`.
+2. The `count` of how many raw items fall into that theme.
+3. A list of `example_items` (up to 3) from the raw data that best represent the theme.
+
+Return your analysis as a JSON object, which is a list of these themes, sorted by count in descending order.
+Example format:
+[
+    {{
+        "theme_name": "Example Theme 1",
+        "count": 42,
+        "example_items": ["Raw item A", "Raw item B"]
+    }},
+    {{
+        "theme_name": "Example Theme 2",
+        "count": 19,
+        "example_items": ["Raw item C", "Raw item D", "Raw item E"]
+    }}
+]
+
+Items that occurred more than once are listed once, followed by their number of occurrences, e.g. "(x3)". Count such an item that many times.
+
+Here is the list of raw items to analyze:
+---
+{items_str}
+---
+"""
+
+# Several small categories are analysed in one request to save round-trips and
+# repeated instructions; the model returns one theme list per category key
+_THEMATIC_BATCH_USER_PROMPT_TEMPLATE = """
+Analyze each of the following lists of raw items separately. Within each list, group similar items into meaningful, high-level themes.
+
+For each theme, provide:
+1. A concise `theme_name`.
+2. The `count` of how many raw items fall into that theme.
+3. A list of `example_items` (up to 3) from the raw data that best represent the theme.
+
+Return your analysis as a JSON object with one entry per list, keyed by the list key given in its heading. Each value is a list of that list's themes, sorted by count in descending order.
+Example format:
+{{
+    "list_key_1": [
+        {{
+            "theme_name": "Example Theme 1",
+            "count": 42,
+            "example_items": ["Raw item A", "Raw item B"]
+        }}
+    ],
+    "list_key_2": [
+        {{
+            "theme_name": "Example Theme 2",
+            "count": 19,
+            "example_items": ["Raw item C", "Raw item D", "Raw item E"]
+        }}
+    ]
+}}
+
+Items that occurred more than once are listed once, followed by their number of occurrences, e.g. "(x3)". Count such an item that many times.
+
+Here are the lists of raw items to analyze:
+{sections}
+"""
+
+_THEMATIC_BATCH_SECTION_TEMPLATE = """
+### List key: {category_key} ({item_description})
+---
+{items_str}
+---
+"""
+
+# Appended to a report whose generation broke off part way through
+_REPORT_INCOMPLETE_NOTE = (
+    "\n\n---\n\n**Report generation was interrupted; this report is incomplete.**\n"
+)
+
+# Lists collected from every thread analysis, in report order
+_AGGREGATED_KEYS = (
+    "main_pain_points",
+    "helper_challenges",
+    "mentioned_solutions",
+    "unmet_needs",
+    "key_tech_topics",
+)
 
 
 class ReportSynthesizer:
@@ -17,6 +112,9 @@ class ReportSynthesizer:
         self.config = config
         self.llm = llm_client
         self.file_manager = FileManager()
+        self.text_processor = TextProcessor()
+        # Content of the report last streamed into the partial report file
+        self.streamed_report = None
 
     def aggregate_data(self, analysis_data: list[dict]) -> dict:
         """
@@ -28,27 +126,27 @@ class ReportSynthesizer:
         Returns:
             Dictionary with aggregated data
         """
+        # Skip items that had errors during the previous stage
+        analyzed = [
+            (item, item.get("analysis", {}))
+            for item in analysis_data
+            if isinstance(item.get("analysis", {}), dict)
+        ]
+
+        # Concatenate each key's lists from every analysis into a master list,
+        # covering any extra categories the concept config defines
+        keys = dict.fromkeys((*_AGGREGATED_KEYS, *self.config.analysis_categories))
         aggregated = {
-            "main_pain_points": [],
-            "helper_challenges": [],
-            "mentioned_solutions": [],
-            "unmet_needs": [],
-            "key_tech_topics": [],
+            key: list(
+                chain.from_iterable(analysis.get(key, []) for _, analysis in analyzed)
+            )
+            for key in keys
         }
-        high_value_threads = []
-
-        for item in analysis_data:
-            analysis = item.get("analysis", {})
-            # Skip items that had errors during the previous stage
-            if not isinstance(analysis, dict):
-                continue
-
-            for key in aggregated.keys():
-                # Extend the master list with the list from the current item
-                aggregated[key].extend(analysis.get(key, []))
-
-            if analysis.get("is_high_value"):
-                high_value_threads.append(item.get("permalink"))
+        high_value_threads = [
+            item.get("permalink")
+            for item, analysis in analyzed
+            if analysis.get("is_high_value")
+        ]
 
         print("Data Aggregation Complete:")
         for key, value in aggregated.items():
@@ -57,6 +155,132 @@ class ReportSynthesizer:
         aggregated["high_value_threads"] = high_value_threads
         return aggregated
 
+    @staticmethod
+    def format_items(items_list: list[str]) -> str:
+        """
+        Format items as a bulleted list for a thematic analysis prompt.
+
+        Repeated items are listed once with their count, most common first,
+        which keeps the prompt short when many threads raise the same point.
+        Items differing only in case, spacing or a trailing full stop count
+        as one and are shown as first seen.
+
+        Args:
+            items_list: List of items to format
+
+        Returns:
+            Bulleted list of items
+        """
+        counts = Counter()
+        first_seen = {}
+        for item in items_list:
+            text = str(item).strip()
+            key = " ".join(text.lower().split()).rstrip(".")
+            counts[key] += 1
+            first_seen.setdefault(key, text)
+        return "\n".join(
+            f"- {first_seen[key]} (x{count})" if count > 1 else f"- {first_seen[key]}"
+            for key, count in counts.most_common()
+        )
+
+    def build_thematic_batches(self, aggregated_data: dict) -> list[list[str]]:
+        """
+        Group analysis categories into batches for
+        perform_batched_thematic_analysis.
+
+        Batches close once their items would pass THEMATIC_BATCH_MAX_TOKENS,
+        so large categories are analysed on their own. A category over the
+        budget, or with no items, gets a batch to itself.
+
+        Args:
+            aggregated_data: Dictionary with aggregated data
+
+        Returns:
+            List of category key batches, in config order
+        """
+        max_tokens = self.llm.settings.thematic_batch_max_tokens
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for category_key in self.config.analysis_categories:
+            items_list = aggregated_data[category_key]
+            tokens = self.text_processor.estimate_token_count(
+                self.format_items(items_list)
+            )
+            if not items_list or tokens > max_tokens:
+                batches.append([category_key])
+                continue
+            if batch and batch_tokens + tokens > max_tokens:
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(category_key)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def perform_batched_thematic_analysis(
+        self, category_keys: list[str], aggregated_data: dict
+    ) -> dict:
+        """
+        Cluster the items of several categories into themes with one LLM
+        request. Categories missing from the response are retried one at a
+        time with perform_thematic_analysis.
+
+        Args:
+            category_keys: Keys of the categories to analyze
+            aggregated_data: Dictionary with aggregated data
+
+        Returns:
+            Dictionary of thematic analysis results by category key
+        """
+        categories = self.config.analysis_categories
+        if len(category_keys) == 1:
+            category_key = category_keys[0]
+            return {
+                category_key: self.perform_thematic_analysis(
+                    aggregated_data[category_key],
+                    categories[category_key]["name"],
+                    categories[category_key]["description"],
+                )
+            }
+
+        names = ", ".join(f"'{categories[key]['name']}'" for key in category_keys)
+        print(f"\nPerforming thematic analysis for {names}...")
+        sections = "".join(
+            _THEMATIC_BATCH_SECTION_TEMPLATE.format(
+                category_key=key,
+                item_description=categories[key]["description"],
+                items_str=self.format_items(aggregated_data[key]),
+            )
+            for key in category_keys
+        )
+
+        messages = [
+            {"role": "system", "content": _THEMATIC_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": _THEMATIC_BATCH_USER_PROMPT_TEMPLATE.format(
+                    sections=sections
+                ),
+            },
+        ]
+        response = self.llm.call_with_json_response(
+            messages, self.llm.settings.synthesis_model
+        )
+
+        results = {}
+        for key in category_keys:
+            if isinstance(response, dict) and isinstance(response.get(key), list):
+                results[key] = response[key]
+            else:
+                print(f"  -> No themes returned for '{key}', analyzing it alone.")
+                results.update(
+                    self.perform_batched_thematic_analysis([key], aggregated_data)
+                )
+        return results
+
     def perform_thematic_analysis(
         self, items_list: list[str], category_name: str, item_description: str
     ) -> dict | None:
@@ -76,39 +300,11 @@ class ReportSynthesizer:
             print("  -> No items to analyze.")
             return {}
 
-        # Create a string of all items, separated by newlines
-        items_str = "\n".join(f"- {item}" for item in items_list)
-
-        system_prompt = "You are a data analyst specializing in qualitative data. Your task is to perform thematic analysis on a list of user-provided items, group them into high-level categories, and count the occurrences for each category."
-
-        user_prompt = f"""
-        Analyze the following list of raw '{item_description}'. Group similar items into meaningful, high-level themes.
-
-        For each theme, provide:
-        1. A concise `theme_name`.
-        2. The `count` of how many raw items fall into that theme.
-        3. A list of `example_items` (up to 3) from the raw data that best represent the theme.
-
-        Return your analysis as a JSON object, which is a list of these themes, sorted by count in descending order.
-        Example format:
-        [
-            {{
-                "theme_name": "Example Theme 1",
-                "count": 42,
-                "example_items": ["Raw item A", "Raw item B"]
-            }},
-            {{
-                "theme_name": "Example Theme 2",
-                "count": 19,
-                "example_items": ["Raw item C", "Raw item D", "Raw item E"]
-            }}
-        ]
-
-        Here is the list of raw items to analyze:
-        ---
-        {items_str}
-        ---
-        """
+        system_prompt = _THEMATIC_SYSTEM_PROMPT
+        user_prompt = _THEMATIC_USER_PROMPT_TEMPLATE.format(
+            item_description=item_description,
+            items_str=self.format_items(items_list),
+        )
 
         messages = [
             {"role": "system", "content": system_prompt},
@@ -131,26 +327,34 @@ class ReportSynthesizer:
         """
         print("\nGenerating final market validation report...")
 
-        # Build a comprehensive prompt with all our structured data
-        full_context = ""
+        # Build a comprehensive prompt with all our structured data, collecting
+        # fragments and joining once at the end
+        parts = []
         for key, summary in thematic_summaries.items():
-            full_context += f"## Thematic Summary for: {key}\n\n"
+            parts.append(f"## Thematic Summary for: {key}\n\n")
             if isinstance(summary, list) and summary:
                 for theme in summary:
                     if isinstance(theme, dict):
-                        full_context += f"- **Theme:** {theme.get('theme_name', 'N/A')} (Count: {theme.get('count', 0)})\n"
-                        full_context += f"  - Examples: {'; '.join(theme.get('example_items', []))}\n"
+                        parts.append(
+                            f"- **Theme:** {theme.get('theme_name', 'N/A')} (Count: {theme.get('count', 0)})\n"
+                        )
+                        parts.append(
+                            f"  - Examples: {'; '.join(theme.get('example_items', []))}\n"
+                        )
                     else:
-                        full_context += f"- **Item:** {theme}\n"
+                        parts.append(f"- **Item:** {theme}\n")
             elif key == "high_value_threads":
-                full_context += f"Found {len(summary)} high-value discussion threads.\n"
+                parts.append(f"Found {len(summary)} high-value discussion threads.\n")
             elif isinstance(summary, dict) and "error" in summary:
-                full_context += (
+                parts.append(
                     f"Error processing {key}: {summary.get('error', 'Unknown error')}\n"
                 )
             else:
-                full_context += f"Data type: {type(summary).__name__}, Length: {len(summary) if hasattr(summary, '__len__') else 'N/A'}\n"
-            full_context += "\n---\n"
+                parts.append(
+                    f"Data type: {type(summary).__name__}, Length: {len(summary) if hasattr(summary, '__len__') else 'N/A'}\n"
+                )
+            parts.append("\n---\n")
+        full_context = "".join(parts)
 
         system_prompt = self.config.report_system_prompt
         user_prompt = self.config.report_user_prompt_template.format(
@@ -162,10 +366,39 @@ class ReportSynthesizer:
             {"role": "user", "content": user_prompt},
         ]
 
-        report_content = self.llm.call_api(
-            messages, self.llm.settings.synthesis_model, response_format="text"
-        )
-        return report_content if report_content else "# Report Generation Failed"
+        # Stream the report into a partial file next to the report as the model
+        # writes it, so it can be followed while the rest is still being
+        # generated. save_report moves it into place once it is done, so a run
+        # that fails part way leaves the previous report untouched.
+        partial_file = self.partial_report_path()
+        os.makedirs(os.path.dirname(partial_file), exist_ok=True)
+        self.streamed_report = None
+        print(f"Writing report to {partial_file} as it is generated...")
+        report_parts = []
+        try:
+            with open(partial_file, "w", encoding="utf-8") as f:
+                try:
+                    for chunk in self.llm.call_api_stream(
+                        messages, self.llm.settings.synthesis_model
+                    ):
+                        f.write(chunk)
+                        f.flush()
+                        report_parts.append(chunk)
+                except LLMStreamError as e:
+                    print(f"Report generation stopped early: {e}")
+                    # Keep what was written, but make clear it is not the
+                    # full report
+                    report_parts.append(_REPORT_INCOMPLETE_NOTE)
+                    f.write(_REPORT_INCOMPLETE_NOTE)
+        except BaseException:
+            self.file_manager.remove_file(partial_file)
+            raise
+
+        if not report_parts:
+            self.file_manager.remove_file(partial_file)
+            return "# Report Generation Failed"
+        self.streamed_report = "".join(report_parts)
+        return self.streamed_report
 
     def save_results(self, thematic_summaries: dict, report: str) -> None:
         """
@@ -175,20 +408,49 @@ class ReportSynthesizer:
             thematic_summaries: Dictionary of thematic analysis results
             report: Generated report content string
         """
-        # Save the structured thematic summary
+        self.save_thematic_summary(thematic_summaries)
+        self.save_report(report)
+
+    def save_thematic_summary(self, thematic_summaries: dict) -> None:
+        """
+        Save the structured thematic summary as JSON.
+
+        Args:
+            thematic_summaries: Dictionary of thematic analysis results
+        """
         thematic_file = self.config.get_file_path("thematic")
         self.file_manager.save_json(thematic_summaries, thematic_file)
         print(f"\nSaved thematic summary to {thematic_file}")
 
-        # Save the final report as a Markdown file
+    def save_report(self, report: str) -> None:
+        """
+        Save the final report as a Markdown file.
+
+        Args:
+            report: Generated report content string
+        """
         report_file = self.config.get_file_path("report")
-        self.file_manager.save_text(report, report_file)
+        if report == self.streamed_report:
+            # generate_report already wrote this report to the partial file
+            os.replace(self.partial_report_path(), report_file)
+            self.streamed_report = None
+        else:
+            self.file_manager.save_text(report, report_file)
         print(f"Saved final market validation report to {report_file}")
 
-    def synthesize(self) -> bool:
+    def partial_report_path(self) -> str:
+        """Path the report is streamed to while it is being generated."""
+        return f"{self.config.get_file_path('report')}.partial"
+
+    def synthesize(self, analysis_data: list[dict] | None = None) -> bool:
         """
         Main synthesis pipeline.
 
+        Args:
+            analysis_data: Optional analysis results already in memory, such
+                as those of an analysis step run in the same process; read
+                from the analysis file when omitted
+
         Returns:
             True if successful, False otherwise
         """
@@ -198,7 +460,8 @@ class ReportSynthesizer:
 
         # Load analysis data
         analysis_file = self.config.get_file_path("analysis")
-        analysis_data = self.file_manager.load_json(analysis_file)
+        if analysis_data is None:
+            analysis_data = self.file_manager.load_json(analysis_file)
         if not analysis_data:
             print(f"No analysis data found at {analysis_file}")
             return False
@@ -211,23 +474,39 @@ class ReportSynthesizer:
         # Phase 0: Aggregate all the data into master lists
         aggregated_data = self.aggregate_data(analysis_data)
 
-        # Phase 1: Perform thematic analysis on each category from config
-        thematic_summaries = {}
-        for category_key, category_info in self.config.analysis_categories.items():
-            thematic_summaries[category_key] = self.perform_thematic_analysis(
-                aggregated_data[category_key],
-                category_info["name"],
-                category_info["description"],
-            )
+        # Phase 1: Perform thematic analysis on each category from config.
+        # Small categories share a request; the batches are independent, so up
+        # to LLM_WORKERS of them run at once.
+        batches = self.build_thematic_batches(aggregated_data)
+        with ThreadPoolExecutor(max_workers=self.llm.settings.llm_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.perform_batched_thematic_analysis, batch, aggregated_data
+                )
+                for batch in batches
+            ]
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        thematic_summaries = {
+            key: results[key] for key in self.config.analysis_categories
+        }
 
         # Add the non-LLM aggregated data
         thematic_summaries["high_value_threads"] = aggregated_data["high_value_threads"]
 
-        # Phase 2: Generate the final human-readable report using config prompts
-        final_report = self.generate_report(thematic_summaries)
+        # Phase 2: Generate the final human-readable report using config prompts.
+        # The thematic summary is saved in the background meanwhile, so the
+        # write does not delay the slowest request of the run.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            thematic_saved = executor.submit(
+                self.save_thematic_summary, thematic_summaries
+            )
+            final_report = self.generate_report(thematic_summaries)
+            thematic_saved.result()
 
-        # Save results
-        self.save_results(thematic_summaries, final_report)
+        # Save the final report
+        self.save_report(final_report)
 
         print("\nSynthesis complete!")
         return True
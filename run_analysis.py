@@ -8,9 +8,6 @@ import argparse
 import sys
 import os
 import time
-from reddit_fetcher import RedditFetcher
-from report_synthesizer import ReportSynthesizer
-from thread_analyzer import ThreadAnalyzer
 from utils import ConfigManager, Settings, FileManager, LLMClient, Config
 
 
@@ -21,6 +18,9 @@ class AnalysisRunner:
         self.config = self.load_concept_config(config_path)
         self.settings = settings
         self.llm_client = LLMClient(settings)
+        # Results of the analysis step, handed straight to synthesis when both
+        # run in this process instead of being read back from disk
+        self.analysis_results = None
         self.step_names = {
             "fetch": "Fetching Reddit Threads",
             "analyze": "Analyzing Threads with LLM",
@@ -102,13 +102,13 @@ class AnalysisRunner:
         """Run the data fetching step to collect Reddit threads."""
         self.print_step_header(self.step_names["fetch"])
         try:
-            # Create Reddit fetcher and fetch data
-            fetcher = RedditFetcher(self.config, self.settings)
-            threads = fetcher.fetch_all_data()
+            # Imported here so runs that skip fetching never load praw
+            from reddit_fetcher import RedditFetcher
 
-            # Save results
+            # Create Reddit fetcher and write each thread out as it is fetched
+            fetcher = RedditFetcher(self.config, self.settings)
             output_file = self.config.get_file_path("threads")
-            FileManager.save_json(threads, output_file)
+            FileManager.save_json(fetcher.iter_threads(), output_file)
         except Exception as e:
             print(f"Error in {self.step_names['fetch']}: {e}")
             raise
@@ -133,6 +133,8 @@ class AnalysisRunner:
                 )
                 return
 
+            from thread_analyzer import ThreadAnalyzer
+
             # Create analyzer and run analysis
             analyzer = ThreadAnalyzer(self.config, self.llm_client, self.settings)
             analysis_results, filtered_out_threads = analyzer.analyze_threads(threads)
@@ -141,11 +143,15 @@ class AnalysisRunner:
             analysis_file = self.config.get_file_path("analysis")
             FileManager.save_json(analysis_results, analysis_file)
             print(f"Saved analysis results to {analysis_file}")
+            self.analysis_results = analysis_results
 
             # Save filtered out threads
             filtered_file = self.config.get_file_path("filtered_out")
             FileManager.save_json(filtered_out_threads, filtered_file)
             print(f"Saved filtered out threads to {filtered_file}")
+
+            # The results are complete, so the resume checkpoint is no longer needed
+            FileManager.remove_file(self.config.get_file_path("analysis_progress"))
         except Exception as e:
             print(f"Error in {self.step_names['analyze']}: {e}")
             raise
@@ -155,9 +161,10 @@ class AnalysisRunner:
     def synthesize_step(self) -> None:
         """Run the synthesis step to generate the final report."""
         self.print_step_header(self.step_names["synthesize"])
-        llm_client = LLMClient(self.settings)
-        synthesizer = ReportSynthesizer(self.config, llm_client)
-        success = synthesizer.synthesize()
+        from report_synthesizer import ReportSynthesizer
+
+        synthesizer = ReportSynthesizer(self.config, self.llm_client)
+        success = synthesizer.synthesize(self.analysis_results)
         if not success:
             print(f"Error in {self.step_names['synthesize']}")
             raise
@@ -167,14 +174,15 @@ class AnalysisRunner:
         """Print a summary of the analysis pipeline execution."""
         minutes, seconds = divmod(elapsed_time, 60)
 
+        report_path = self.config.get_file_path("report")
+
         self.print_header("Analysis Pipeline Summary")
         print(f"Total time: {int(minutes)}m {int(seconds)}s")
         print(f"Results saved in: {self.config.get_file_path('results')}")
-        print(f"Final report: {self.config.get_file_path('report')}")
+        print(f"Final report: {report_path}")
         print(f"Thematic summary: {self.config.get_file_path('thematic')}")
 
         # Check if final report exists and show file size
-        report_path = self.config.get_file_path("report")
         if not os.path.exists(report_path):
             print("Final report not found. Please check the synthesis step.")
             sys.exit(1)
@@ -189,9 +197,6 @@ class AnalysisRunner:
 
 
 def main():
-    settings = Settings()
-    settings.validate_required_settings()
-
     parser = argparse.ArgumentParser(
         description="Run complete Reddit market research analysis pipeline",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -228,8 +233,21 @@ Examples:
         help="Skip synthesis/report generation step",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached LLM responses and send every request again",
+    )
+
+    # Arguments are parsed first so --help and usage errors exit before any
+    # settings are loaded or output directories are created
     args = parser.parse_args()
 
+    settings = Settings()
+    settings.validate_required_settings()
+    if args.no_cache:
+        settings.llm_cache = False
+
     # Validate config file
     runner = AnalysisRunner(args.config, settings)
 
@@ -246,8 +264,11 @@ Examples:
 
     steps = {"fetch": run_fetch, "analyze": run_analyze, "synthesize": run_synthesize}
 
-    # Run the analysis steps
-    runner.run_steps(steps)
+    # Run the analysis steps, sharing one LLM client and its connections
+    try:
+        runner.run_steps(steps)
+    finally:
+        runner.llm_client.close()
 
 
 if __name__ == "__main__":
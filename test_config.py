@@ -9,7 +9,7 @@ from utils import Config, ConfigManager
 
 
 def load_concept_config(config_path: str) -> Config:
-    """Load configuration from a Python file."""
+    """Load configuration from a Python or TOML file."""
     config_manager = ConfigManager(config_path)
     return config_manager.config
 
@@ -86,7 +86,9 @@ def main():
     # Find all config files automatically
     import glob
 
-    configs_to_test = glob.glob("config/*_config.py")
+    configs_to_test = glob.glob("config/*_config.py") + glob.glob(
+        "config/*_config.toml"
+    )
     configs_to_test = list(set(configs_to_test))  # Remove duplicates
 
     # Filter out test scripts and other non-config files
@@ -1,7 +1,62 @@
 """Reddit thread analysis using LLM."""
 
-import time
-from utils import TextProcessor, Config, Settings, LLMClient
+import hashlib
+import heapq
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
+from typing import BinaryIO
+from utils import TextProcessor, Config, Settings, LLMClient, FileManager
+
+# Appended to the concept's filter system prompt when several threads are sent
+# in one request, replacing its single yes/no answer with one verdict per thread
+_FILTER_BATCH_INSTRUCTIONS = """
+
+You will be given several numbered Reddit threads instead of one. Answer the question for each thread separately. Respond with a JSON object of the form {"results": [{"idx": 1, "relevant": "yes"}, {"idx": 2, "relevant": "no"}]}, with exactly one entry per thread."""
+
+# Appended to the concept's filter system prompt for single-thread requests,
+# which are sent in JSON mode, so the answer comes back in a known shape
+_FILTER_JSON_INSTRUCTIONS = """
+
+Respond with a JSON object of the form {"relevant": "yes"} or {"relevant": "no"}."""
+
+# A yes or no at the start of an answer, e.g. "Yes." or "no - it is about..."
+_RE_VERDICT = re.compile(r"\W*(yes|no)\b", re.IGNORECASE)
+
+
+def _parse_verdict(value) -> bool | None:
+    """
+    Read a filter verdict strictly, so words like "yesterday" or a "yes"
+    buried in an explanation are not taken as relevant.
+
+    Args:
+        value: Boolean, "yes"/"no" answer, or JSON text holding either
+
+    Returns:
+        The verdict, or None if the value is not a clear yes or no
+    """
+    if isinstance(value, bool):
+        return value
+    if not isinstance(value, str):
+        return None
+
+    match = _RE_VERDICT.match(value)
+    if match:
+        return match.group(1).lower() == "yes"
+
+    # JSON mode answers, e.g. {"relevant": "yes"} or {"answer": true}
+    try:
+        decoded = FileManager.loads(value)
+    except ValueError:
+        return None
+    if isinstance(decoded, dict):
+        if "relevant" in decoded:
+            return _parse_verdict(decoded["relevant"])
+        if len(decoded) == 1:
+            return _parse_verdict(next(iter(decoded.values())))
+    return None
 
 
 class ThreadAnalyzer:
@@ -21,41 +76,304 @@ class ThreadAnalyzer:
         self.settings = settings
         self.text_processor = TextProcessor()
 
-    def build_thread_context(self, thread_object: dict) -> str:
+        # Filter verdicts keyed by a BLAKE2b digest of the filter content, so
+        # reposts and crossposts with the same title and body are only sent
+        # to the filter model once
+        self.filter_verdicts: dict[bytes, bool] = {}
+
+        # Stage 2 results are appended to a JSON Lines checkpoint as they
+        # arrive; analyses found there are reused when a run is resumed.
+        # Keyed by post ID and a digest of the analyzed context.
+        self.checkpoint_file = config.get_file_path("analysis_progress")
+        self.saved_analyses: dict[str, dict] = {}
+
+        # The filter prompt only varies in {thread_content}, so the template is
+        # rendered once around a placeholder and split into its fixed text.
+        # Templates using other fields keep going through str.format.
+        self.filter_prompt_parts = None
+        template = config.filter_user_prompt_template
+        try:
+            rendered = template.format(thread_content="\0")
+            if rendered.count("\0") == 1:
+                prefix, suffix = rendered.split("\0")
+                # Conversions or format specs would not survive the split
+                if template.format(thread_content="\0\0") == f"{prefix}\0\0{suffix}":
+                    self.filter_prompt_parts = (prefix, suffix)
+        except (KeyError, IndexError, ValueError):
+            pass
+
+        # Concept keywords as one case-insensitive alternation for the local
+        # pre-filter, longest first so phrases win over their prefixes. The
+        # ends are checked with lookarounds rather than \b, which never matches
+        # after a keyword ending in punctuation such as "401(k)" or "C++"
+        keywords = sorted(set(config.keywords), key=len, reverse=True)
+        self.keyword_pattern = None
+        if keywords:
+            self.keyword_pattern = re.compile(
+                r"(?<!\w)(?:" + "|".join(map(re.escape, keywords)) + r")(?!\w)",
+                re.IGNORECASE,
+            )
+
+    def build_thread_context(
+        self, thread_object: dict, max_tokens: int | None = None
+    ) -> str:
         """
         Build a single string from a thread object with nested comments,
         using indentation to show hierarchy.
 
+        With a token budget, a thread that does not fit keeps its highest
+        scoring comments instead of being dropped: comments are taken in
+        score order, a reply only once its parent is in, and the rest are
+        replaced by a note saying how many were left out.
+
         Args:
             thread_object: Thread data dictionary
+            max_tokens: Optional token budget for the whole context
 
         Returns:
             Formatted context string
         """
-        context = f"POST TITLE: {thread_object.get('title', '')}\n"
-        context += f"POST BODY: {thread_object.get('selftext', '[no body]')}\n\n--- COMMENTS ---\n\n"
+        # Collect fragments and join once at the end; repeated string
+        # concatenation copies the whole context on every append
+        parts = [
+            f"POST TITLE: {thread_object.get('title', '')}\n",
+            f"POST BODY: {thread_object.get('selftext', '[no body]')}\n\n--- COMMENTS ---\n\n",
+        ]
+
+        # Flatten the comment tree in reading order with an explicit stack
+        # rather than recursion, so deep reply chains cost no extra Python
+        # frames. Children are pushed in reverse so they keep their original
+        # order, each carrying its indent string (4 spaces per level) built
+        # from its parent's rather than multiplied out for every comment.
+        comment_texts = []
+        scores = []
+        children = []  # Indices of each comment's replies
+        top_level = []
+        comments = thread_object.get("comments", [])
+        stack = [(comment, "", top_level) for comment in reversed(comments)]
+        while stack:
+            comment, indent, siblings = stack.pop()
+            index = len(comment_texts)
+            siblings.append(index)
+            replies = []
+            children.append(replies)
+            comment_texts.append(
+                f"{indent}Comment (Score: {comment.get('score', 0)}):\n"
+                f"{indent}{comment.get('body', '')}\n{indent}---\n"
+            )
+            scores.append(comment.get("score") or 0)
+            if comment.get("replies"):
+                reply_indent = indent + "    "
+                stack.extend(
+                    (reply, reply_indent, replies)
+                    for reply in reversed(comment["replies"])
+                )
+
+        if max_tokens is None:
+            return "".join(parts + comment_texts)
+
+        # One extra token per fragment keeps the running total an upper bound
+        # on the estimate for the joined context
+        estimate = self.text_processor.estimate_token_count
+        tokens_used = sum(estimate(part) + 1 for part in parts)
+        comment_tokens = [estimate(text) + 1 for text in comment_texts]
+        if tokens_used + sum(comment_tokens) <= max_tokens:
+            return "".join(parts + comment_texts)
+
+        # Over budget: room is kept for the omission note, then comments are
+        # admitted highest score first (earlier comments win ties), each
+        # making its replies eligible once it is in
+        omitted_note = "[... {} lower-voted comments omitted ...]\n"
+        tokens_used += estimate(omitted_note.format(len(comment_texts))) + 1
+        kept = [False] * len(comment_texts)
+        candidates = [(-scores[index], index) for index in top_level]
+        heapq.heapify(candidates)
+        while candidates:
+            _, index = heapq.heappop(candidates)
+            if tokens_used + comment_tokens[index] > max_tokens:
+                continue
+            tokens_used += comment_tokens[index]
+            kept[index] = True
+            for reply in children[index]:
+                heapq.heappush(candidates, (-scores[reply], reply))
+
+        parts.extend(text for text, keep in zip(comment_texts, kept) if keep)
+        parts.append(omitted_note.format(kept.count(False)))
+        return "".join(parts)
+
+    def build_filter_content(self, thread: dict) -> str:
+        """
+        Build the short thread summary sent to the filter model.
+
+        Args:
+            thread: Thread data dictionary
+
+        Returns:
+            Thread title and body
+        """
+        # We only need the thread title and body for the initial filter to save tokens
+        return f"Title: {thread.get('title', '')}\nBody: {thread.get('selftext', '')}"
+
+    def count_keyword_matches(self, thread: dict) -> int:
+        """
+        Count concept keyword occurrences in a thread's title and body.
+
+        Args:
+            thread: Thread data dictionary
+
+        Returns:
+            Number of keyword matches
+        """
+        if self.keyword_pattern is None:
+            return 0
+        return len(self.keyword_pattern.findall(self.build_filter_content(thread)))
+
+    def build_filter_prompt(self, thread_content: str) -> str:
+        """
+        Fill the concept's filter prompt template with thread content.
+
+        Args:
+            thread_content: Filter content for one or more threads
+
+        Returns:
+            Filter user prompt
+        """
+        if self.filter_prompt_parts is None:
+            return self.config.filter_user_prompt_template.format(
+                thread_content=thread_content
+            )
+        prefix, suffix = self.filter_prompt_parts
+        return prefix + thread_content + suffix
+
+    def is_thread_relevant(self, thread: dict) -> bool:
+        """
+        Ask the filter model whether a single thread is relevant.
+
+        Args:
+            thread: Thread data dictionary
+
+        Returns:
+            True if the model clearly answered yes
+        """
+        filter_user_prompt = self.build_filter_prompt(self.build_filter_content(thread))
+
+        prompt_messages = [
+            {
+                "role": "system",
+                "content": self.config.filter_system_prompt
+                + _FILTER_JSON_INSTRUCTIONS,
+            },
+            {"role": "user", "content": filter_user_prompt},
+        ]
+
+        response = self.llm.call_api(prompt_messages, self.settings.filter_model)
+        return _parse_verdict(response) is True
+
+    def are_threads_relevant(self, threads: list[dict]) -> list[bool]:
+        """
+        Ask the filter model about several threads in a single request.
 
-        # Helper function to recursively process comments
-        def append_comments_recursive(comments_list: list[dict], indent_level: int = 0):
-            nonlocal context
-            indent = "    " * indent_level  # 4 spaces per indent level
-            for comment in comments_list:
-                context += f"{indent}Comment (Score: {comment.get('score', 0)}):\n"
-                context += f"{indent}{comment.get('body', '')}\n{indent}---\n"
-                # If there are replies, recurse
-                if comment.get("replies"):
-                    append_comments_recursive(comment["replies"], indent_level + 1)
+        Threads the model leaves out of its answer or gives no clear yes or
+        no for, or every thread if the answer cannot be parsed, are filtered
+        one at a time instead.
 
-        # Start the recursion on the top-level comments
-        append_comments_recursive(thread_object.get("comments", []), 0)
-        return context
+        Args:
+            threads: List of thread data dictionaries
 
-    def filter_threads(self, threads: list[dict]) -> tuple[list[dict], list[dict]]:
+        Returns:
+            List of verdicts in the same order as the threads
+        """
+        thread_content = "\n\n".join(
+            f"Thread {idx}:\n{self.build_filter_content(thread)}"
+            for idx, thread in enumerate(threads, 1)
+        )
+
+        filter_user_prompt = self.build_filter_prompt(thread_content)
+
+        prompt_messages = [
+            {
+                "role": "system",
+                "content": self.config.filter_system_prompt
+                + _FILTER_BATCH_INSTRUCTIONS,
+            },
+            {"role": "user", "content": filter_user_prompt},
+        ]
+
+        response = self.llm.call_with_json_response(
+            prompt_messages, self.settings.filter_model
+        )
+
+        verdicts = {}
+        results = response.get("results") if isinstance(response, dict) else None
+        if isinstance(results, list):
+            for result in results:
+                if isinstance(result, dict) and isinstance(result.get("idx"), int):
+                    verdict = _parse_verdict(result.get("relevant"))
+                    if verdict is not None:
+                        verdicts[result["idx"]] = verdict
+
+        return [
+            verdicts[idx] if idx in verdicts else self.is_thread_relevant(thread)
+            for idx, thread in enumerate(threads, 1)
+        ]
+
+    def build_filter_batches(self, threads: list[dict]) -> list[list[dict]]:
+        """
+        Group threads into batches for are_threads_relevant.
+
+        Batches hold up to FILTER_BATCH_SIZE threads and close early once
+        their filter content would pass FILTER_BATCH_MAX_TOKENS, so a few
+        long posts do not make one oversized prompt. A thread over the
+        budget on its own gets a batch to itself.
+
+        Args:
+            threads: List of thread data dictionaries
+
+        Returns:
+            List of thread batches, in thread order
+        """
+        batch_size = self.settings.filter_batch_size
+        max_tokens = self.settings.filter_batch_max_tokens
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for thread in threads:
+            tokens = self.text_processor.estimate_token_count(
+                self.build_filter_content(thread)
+            )
+            if batch and (
+                len(batch) >= batch_size
+                or (max_tokens > 0 and batch_tokens + tokens > max_tokens)
+            ):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(thread)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def filter_threads(
+        self,
+        threads: list[dict],
+        on_relevant: Callable[[dict], None] | None = None,
+    ) -> tuple[list[dict], list[dict]]:
         """
         Filter threads using a fast, cheap model.
 
+        Up to LLM_WORKERS filter requests are in flight at once, so the
+        network round trips overlap instead of running one after another.
+        With FILTER_BATCH_SIZE above 1, each request covers that many threads.
+        With KEYWORD_FILTER_MIN_MATCHES above 0, threads with fewer concept
+        keyword matches are rejected locally without an LLM call; with
+        KEYWORD_FILTER_ACCEPT_MATCHES above 0, threads with at least that many
+        are accepted locally. Only the band in between reaches the model.
+
         Args:
             threads: List of thread data dictionaries
+            on_relevant: Optional callback for each relevant thread, called
+                in thread order as soon as its verdict is known
 
         Returns:
             Tuple of (relevant_threads, irrelevant_threads)
@@ -64,82 +382,182 @@ class ThreadAnalyzer:
         relevant_threads = []
         irrelevant_threads = []
 
-        for i, thread in enumerate(threads):
-            print(
-                f"Filtering thread {i + 1}/{len(threads)}: {thread.get('title', 'No Title')[:80]}..."
-            )
+        # Only the first thread with each distinct content is sent to the model
+        keys = [
+            hashlib.blake2b(
+                self.build_filter_content(thread).encode("utf-8", "replace"),
+                digest_size=16,
+            ).digest()
+            for thread in threads
+        ]
+        min_matches = self.settings.keyword_filter_min_matches
+        accept_matches = self.settings.keyword_filter_accept_matches
+        use_keywords = self.keyword_pattern is not None and (
+            min_matches > 0 or accept_matches > 0
+        )
+        pending = {}
+        prefiltered = set()
+        for key, thread in zip(keys, threads):
+            if key in self.filter_verdicts or key in pending:
+                continue
+            if use_keywords:
+                matches = self.count_keyword_matches(thread)
+                if min_matches > 0 and matches < min_matches:
+                    self.filter_verdicts[key] = False
+                    prefiltered.add(key)
+                    continue
+                if accept_matches > 0 and matches >= accept_matches:
+                    self.filter_verdicts[key] = True
+                    prefiltered.add(key)
+                    continue
+            pending[key] = thread
+        pending_threads = list(pending.values())
+
+        with ThreadPoolExecutor(max_workers=self.settings.llm_workers) as executor:
+            try:
+                # map yields verdicts in thread order as they become available
+                if self.settings.filter_batch_size > 1:
+                    verdicts = chain.from_iterable(
+                        executor.map(
+                            self.are_threads_relevant,
+                            self.build_filter_batches(pending_threads),
+                        )
+                    )
+                else:
+                    verdicts = executor.map(self.is_thread_relevant, pending_threads)
+                new_verdicts = zip(pending, verdicts)
+
+                for i, (thread, key) in enumerate(zip(threads, keys)):
+                    print(
+                        f"Filtering thread {i + 1}/{len(threads)}: {thread.get('title', 'No Title')[:80]}..."
+                    )
+
+                    # Pending threads are in first-seen order, so the next new
+                    # verdict always belongs to the first unseen key
+                    if key not in self.filter_verdicts:
+                        new_key, verdict = next(new_verdicts)
+                        self.filter_verdicts[new_key] = verdict
+
+                    if self.filter_verdicts[key]:
+                        relevant_threads.append(thread)
+                        if key in prefiltered:
+                            print("  -> RELEVANT (keyword pre-filter)")
+                        else:
+                            print("  -> RELEVANT")
+                        if on_relevant is not None:
+                            on_relevant(thread)
+                    else:
+                        irrelevant_threads.append(thread)
+                        if key in prefiltered:
+                            print("  -> IRRELEVANT (keyword pre-filter)")
+                        else:
+                            print("  -> IRRELEVANT")
+            except BaseException:
+                # map queues every request up front; drop the ones not yet
+                # started so an error or Ctrl-C stops paying for them
+                executor.shutdown(cancel_futures=True)
+                raise
 
-            # We only need the thread title and body for the initial filter to save tokens
-            thread_content_for_filter = (
-                f"Title: {thread.get('title', '')}\nBody: {thread.get('selftext', '')}"
-            )
+        print(
+            f"\nFiltering complete. Found {len(relevant_threads)} potentially relevant threads."
+        )
+        return relevant_threads, irrelevant_threads
 
-            filter_user_prompt = self.config.filter_user_prompt_template.format(
-                thread_content=thread_content_for_filter
-            )
+    def request_analysis(self, thread_context: str) -> dict | None:
+        """
+        Ask the analysis model for a structured analysis of one thread.
 
-            prompt_messages = [
-                {"role": "system", "content": self.config.filter_system_prompt},
-                {"role": "user", "content": filter_user_prompt},
-            ]
+        Args:
+            thread_context: Formatted thread context string
 
-            response = self.llm.call_api(prompt_messages, self.settings.filter_model)
+        Returns:
+            Parsed analysis JSON or error dict
+        """
+        analysis_user_prompt = self.config.analysis_user_prompt_template.format(
+            thread_context=thread_context
+        )
 
-            if response and "yes" in response.lower():
-                relevant_threads.append(thread)
-                print("  -> RELEVANT")
-            else:
-                irrelevant_threads.append(thread)
-                print("  -> IRRELEVANT")
+        prompt_messages = [
+            {"role": "system", "content": self.config.analysis_system_prompt},
+            {"role": "user", "content": analysis_user_prompt},
+        ]
 
-            time.sleep(self.settings.rate_limit_delay)
+        # Use JSON mode for models that support it
+        analysis_json = self.llm.call_with_json_response(
+            prompt_messages, self.settings.analysis_model
+        )
+        return analysis_json
 
-        print(
-            f"\nFiltering complete. Found {len(relevant_threads)} potentially relevant threads."
+    def submit_analysis(
+        self, executor: ThreadPoolExecutor, thread: dict
+    ) -> tuple[dict, Future | None, int, str | None]:
+        """
+        Build a thread's context and queue its analysis request.
+
+        Args:
+            executor: Executor to run the analysis request on
+            thread: Relevant thread data dictionary
+
+        Returns:
+            Tuple of (thread, analysis future, estimated tokens, checkpoint
+            key); the future is None when the context is over the token
+            budget, and the key is None when a checkpointed analysis is reused
+        """
+        # Long threads keep as many comments as fit the token budget
+        thread_context = self.build_thread_context(
+            thread, max_tokens=self.settings.max_tokens_for_analysis
         )
-        return relevant_threads, irrelevant_threads
 
-    def analyze_relevant_threads(self, relevant_threads: list[dict]) -> list[dict]:
+        # A checkpointed analysis is only reused while the thread still reads
+        # the same, e.g. no new comments were fetched since it was analyzed
+        context_digest = hashlib.blake2b(
+            thread_context.encode("utf-8", "replace"), digest_size=16
+        ).hexdigest()
+        checkpoint_key = f"{thread.get('id')}:{context_digest}"
+        saved_analysis = self.saved_analyses.get(checkpoint_key)
+        if saved_analysis is not None:
+            future = Future()
+            future.set_result(saved_analysis)
+            return thread, future, 0, None
+
+        # Simple token check to avoid API errors, e.g. when the post body
+        # alone is over budget
+        estimated_tokens = self.text_processor.estimate_token_count(thread_context)
+        future = None
+        if estimated_tokens <= self.settings.max_tokens_for_analysis:
+            future = executor.submit(self.request_analysis, thread_context)
+        return thread, future, estimated_tokens, checkpoint_key
+
+    def collect_analysis_results(
+        self,
+        jobs: list[tuple[dict, Future | None, int, str | None]],
+        checkpoint: BinaryIO | None = None,
+    ) -> list[dict]:
         """
-        Perform deep analysis on relevant threads.
+        Wait for queued analyses and turn them into result records.
 
         Args:
-            relevant_threads: List of filtered thread data dictionaries
+            jobs: Tuples returned by submit_analysis, in thread order
+            checkpoint: Optional binary file to append each new successful
+                result to, one JSON record per line
 
         Returns:
             List of analysis results
         """
-        print("\n--- STAGE 2: Deep analysis of relevant threads ---")
         final_analysis_results = []
 
-        for i, thread in enumerate(relevant_threads):
+        for i, (thread, future, estimated_tokens, checkpoint_key) in enumerate(jobs):
             print(
-                f"Analyzing thread {i + 1}/{len(relevant_threads)}: {thread.get('title', 'No Title')[:80]}..."
+                f"Analyzing thread {i + 1}/{len(jobs)}: {thread.get('title', 'No Title')[:80]}..."
             )
 
-            thread_context = self.build_thread_context(thread)
-
-            # Simple token check to avoid API errors
-            estimated_tokens = self.text_processor.estimate_token_count(thread_context)
-            if estimated_tokens > self.settings.max_tokens_for_analysis:
+            if future is None:
                 print(
                     f"  -> SKIPPING: Thread context is too long ({estimated_tokens} tokens approx)."
                 )
                 continue
 
-            analysis_user_prompt = self.config.analysis_user_prompt_template.format(
-                thread_context=thread_context
-            )
-
-            prompt_messages = [
-                {"role": "system", "content": self.config.analysis_system_prompt},
-                {"role": "user", "content": analysis_user_prompt},
-            ]
-
-            # Use JSON mode for models that support it
-            analysis_json = self.llm.call_with_json_response(
-                prompt_messages, self.settings.analysis_model
-            )
+            analysis_json = future.result()
 
             if analysis_json is None:
                 print("  -> FAILED: No response from LLM.")
@@ -155,14 +573,20 @@ class ThreadAnalyzer:
                 continue
 
             if "error" not in analysis_json:
-                final_analysis_results.append(
-                    {
-                        "post_id": thread.get("id"),
-                        "post_title": thread.get("title"),
-                        "permalink": thread.get("permalink"),
-                        "analysis": analysis_json,
-                    }
-                )
+                result = {
+                    "post_id": thread.get("id"),
+                    "post_title": thread.get("title"),
+                    "permalink": thread.get("permalink"),
+                    "analysis": analysis_json,
+                }
+                final_analysis_results.append(result)
+                if checkpoint_key is None:
+                    print("  -> Analysis reused from checkpoint.")
+                    continue
+                if checkpoint is not None:
+                    record = {"checkpoint_key": checkpoint_key, **result}
+                    checkpoint.write(FileManager.dumps(record) + b"\n")
+                    checkpoint.flush()
                 print("  -> Analysis successful.")
             else:
                 print(f"  -> FAILED: {analysis_json.get('error', 'Unknown error')}")
@@ -176,8 +600,6 @@ class ThreadAnalyzer:
                     }
                 )
 
-            time.sleep(1)
-
         return final_analysis_results
 
     def analyze_threads(self, threads: list[dict]) -> tuple[list[dict], list[dict]]:
@@ -194,11 +616,43 @@ class ThreadAnalyzer:
         print(f"Description: {self.config.concept_description}")
         print(f"Loaded {len(threads)} threads.")
 
-        # Stage 1: Filter with cheap model
-        relevant_threads, irrelevant_threads = self.filter_threads(threads)
+        # Pick up the analyses an interrupted run already paid for
+        self.saved_analyses = {
+            record["checkpoint_key"]: record["analysis"]
+            for record in FileManager.load_jsonl(self.checkpoint_file)
+            if isinstance(record, dict)
+            and isinstance(record.get("checkpoint_key"), str)
+            and isinstance(record.get("analysis"), dict)
+        }
+        if self.saved_analyses:
+            print(
+                f"Resuming with {len(self.saved_analyses)} analyses from {self.checkpoint_file}"
+            )
+        os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
+
+        # The two stages overlap: each thread the cheap model passes in Stage 1
+        # is queued for deep analysis with the powerful model right away,
+        # instead of waiting for the whole filter pass to finish
+        with (
+            ThreadPoolExecutor(max_workers=self.settings.llm_workers) as executor,
+            open(self.checkpoint_file, "ab") as checkpoint,
+        ):
+            jobs = []
+            try:
+                relevant_threads, irrelevant_threads = self.filter_threads(
+                    threads,
+                    on_relevant=lambda thread: jobs.append(
+                        self.submit_analysis(executor, thread)
+                    ),
+                )
 
-        # Stage 2: Deep analysis with powerful model
-        analysis_results = self.analyze_relevant_threads(relevant_threads)
+                print("\n--- STAGE 2: Deep analysis of relevant threads ---")
+                analysis_results = self.collect_analysis_results(jobs, checkpoint)
+            except BaseException:
+                # Analyses not yet started would run on the expensive model
+                # before the error surfaced; drop them instead
+                executor.shutdown(cancel_futures=True)
+                raise
 
         print("\nAnalysis complete!")
         return analysis_results, irrelevant_threads
@@ -2,15 +2,18 @@
 
 from .config_manager import ConfigManager, Config
 from .settings import Settings
-from .llm_client import LLMClient
+from .llm_client import LLMClient, LLMStreamError
 from .file_manager import FileManager
 from .text_processor import TextProcessor
+from .rate_limiter import RateLimiter
 
 __all__ = [
     "ConfigManager",
     "Config",
     "Settings",
     "LLMClient",
+    "LLMStreamError",
     "FileManager",
     "TextProcessor",
+    "RateLimiter",
 ]
@@ -3,9 +3,18 @@
 import os
 import importlib.util
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict, List
 from dotenv import load_dotenv
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11; TOML configs then need the tomli package
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
 
 @dataclass
 class Config:
@@ -38,29 +47,30 @@ class Config:
     @classmethod
     def from_module(cls, module) -> "Config":
         """Create a Config from a loaded module."""
+        return cls.from_dict(vars(module))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Config":
+        """Create a Config from a mapping of upper-case setting names."""
         load_dotenv()
 
         return cls(
-            concept_name=getattr(module, "CONCEPT_NAME", "unknown_concept"),
-            concept_description=getattr(
-                module, "CONCEPT_DESCRIPTION", "No description provided"
-            ),
-            target_subreddits=getattr(module, "TARGET_SUBREDDITS", []),
-            keywords=getattr(module, "KEYWORDS", []),
-            filter_system_prompt=getattr(module, "FILTER_SYSTEM_PROMPT", ""),
-            filter_user_prompt_template=getattr(
-                module, "FILTER_USER_PROMPT_TEMPLATE", ""
+            concept_name=data.get("CONCEPT_NAME", "unknown_concept"),
+            concept_description=data.get(
+                "CONCEPT_DESCRIPTION", "No description provided"
             ),
-            analysis_system_prompt=getattr(module, "ANALYSIS_SYSTEM_PROMPT", ""),
-            analysis_user_prompt_template=getattr(
-                module, "ANALYSIS_USER_PROMPT_TEMPLATE", ""
+            target_subreddits=data.get("TARGET_SUBREDDITS", []),
+            keywords=data.get("KEYWORDS", []),
+            filter_system_prompt=data.get("FILTER_SYSTEM_PROMPT", ""),
+            filter_user_prompt_template=data.get("FILTER_USER_PROMPT_TEMPLATE", ""),
+            analysis_system_prompt=data.get("ANALYSIS_SYSTEM_PROMPT", ""),
+            analysis_user_prompt_template=data.get(
+                "ANALYSIS_USER_PROMPT_TEMPLATE", ""
             ),
-            analysis_categories=getattr(module, "ANALYSIS_CATEGORIES", {}),
-            report_system_prompt=getattr(module, "REPORT_SYSTEM_PROMPT", ""),
-            report_user_prompt_template=getattr(
-                module, "REPORT_USER_PROMPT_TEMPLATE", ""
-            ),
-            output_file_prefix=getattr(module, "OUTPUT_FILE_PREFIX", "default"),
+            analysis_categories=data.get("ANALYSIS_CATEGORIES", {}),
+            report_system_prompt=data.get("REPORT_SYSTEM_PROMPT", ""),
+            report_user_prompt_template=data.get("REPORT_USER_PROMPT_TEMPLATE", ""),
+            output_file_prefix=data.get("OUTPUT_FILE_PREFIX", "default"),
             output_dir=os.getenv("OUTPUT_DIR", "results"),
             config_dir=os.getenv("CONFIG_DIR", "configs"),
         )
@@ -112,23 +122,28 @@ class Config:
                 + "\n".join(f"  - {error}" for error in errors)
             )
 
-    def get_file_path(self, file_type: str) -> str:
-        """Get standardized file paths based on concept prefix."""
-
-        if file_type == "results":
-            return self.output_dir
-
-        if file_type == "config":
-            return self.config_dir
-
-        paths = {
+    @cached_property
+    def file_paths(self) -> Dict[str, str]:
+        """Standardized file paths based on concept prefix, built on first use."""
+        names = {
             "threads": f"{self.output_file_prefix}_reddit_threads.json",
             "analysis": f"{self.output_file_prefix}_final_analysis_results.json",
             "thematic": f"{self.output_file_prefix}_thematic_summary.json",
             "report": f"{self.output_file_prefix}_market_validation_report.md",
             "filtered_out": f"{self.output_file_prefix}_filtered_out_threads.json",
+            "analysis_progress": f"{self.output_file_prefix}_analysis_progress.jsonl",
         }
-        return os.path.join(self.output_dir, paths[file_type])
+        paths = {
+            file_type: os.path.join(self.output_dir, name)
+            for file_type, name in names.items()
+        }
+        paths["results"] = self.output_dir
+        paths["config"] = self.config_dir
+        return paths
+
+    def get_file_path(self, file_type: str) -> str:
+        """Get standardized file paths based on concept prefix."""
+        return self.file_paths[file_type]
 
 
 class ConfigManager:
@@ -141,7 +156,28 @@ class ConfigManager:
         os.makedirs(self.config.config_dir, exist_ok=True)
 
     def _load_config(self, config_path: str) -> Config:
-        """Load configuration from a Python file and return as Config dataclass."""
+        """Load configuration from a Python or TOML file as a Config dataclass."""
+        if config_path.endswith(".toml"):
+            config = self._load_toml_config(config_path)
+        else:
+            config = self._load_python_config(config_path)
+
+        # Validate the configuration
+        config.validate()
+
+        return config
+
+    def _load_toml_config(self, config_path: str) -> Config:
+        """Parse a TOML config file, which uses the same keys as a Python one."""
+        if tomllib is None:
+            raise ImportError(
+                f"Loading {config_path} needs Python 3.11+ or the tomli package"
+            )
+        with open(config_path, "rb") as f:
+            return Config.from_dict(tomllib.load(f))
+
+    def _load_python_config(self, config_path: str) -> Config:
+        """Execute a Python config file and read its module-level settings."""
         spec = importlib.util.spec_from_file_location(
             os.path.basename(config_path), config_path
         )
@@ -153,9 +189,4 @@ class ConfigManager:
         spec.loader.exec_module(module)
 
         # Convert module to dataclass
-        config = Config.from_module(module)
-
-        # Validate the configuration
-        config.validate()
-
-        return config
+        return Config.from_module(module)
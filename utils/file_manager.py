@@ -1,7 +1,15 @@
 """File operations utilities for Reddit Market Research Framework."""
 
 import json
+import mmap
 import os
+from collections.abc import Iterable
+from typing import BinaryIO
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
 
 class FileManager:
@@ -19,24 +27,124 @@ class FileManager:
             Loaded data or None if failed
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            if orjson is None:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    return json.load(f)
+
+            # Parse straight from a read-only mapping of the file, so large
+            # fetches are not first copied into one big bytes object
+            with open(filepath, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return orjson.loads(b"")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as buffer:
+                        return orjson.loads(buffer)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading {filepath}: {e}")
             return None
 
     @staticmethod
-    def save_json(data: dict | list, filepath: str) -> None:
+    def load_jsonl(filepath: str) -> list:
+        """
+        Load records from a JSON Lines file, one JSON value per line.
+
+        A missing file yields no records. Lines that cannot be decoded, such
+        as a last line cut short when a run was interrupted, are skipped.
+
+        Args:
+            filepath: Path to the JSON Lines file
+
+        Returns:
+            List of decoded records
+        """
+        records = []
+        try:
+            with open(filepath, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        records.append(FileManager.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"Skipping unreadable line in {filepath}")
+        except FileNotFoundError:
+            pass
+        return records
+
+    @staticmethod
+    def loads(data: str | bytes):
+        """
+        Decode a JSON document, using orjson when it is installed.
+
+        Args:
+            data: JSON document as text or UTF-8 bytes
+
+        Returns:
+            Decoded data
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(data) -> bytes:
+        """
+        Encode data as compact UTF-8 JSON.
+
+        Args:
+            data: Data to encode
+
+        Returns:
+            Encoded JSON bytes
+        """
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def save_json(data: dict | Iterable, filepath: str) -> None:
         """
         Save data as JSON to a file.
 
+        Lists and other iterables, such as generators, are written as an
+        array with one record per line. Each record is encoded and written
+        as it arrives, so the full document is never built in memory and the
+        file can be read line by line.
+
+        The data is written to a temporary file that replaces the target only
+        once it is complete, so a run interrupted part way, for example while
+        a generator is still fetching, leaves the previous file intact.
+
         Args:
             data: Data to save
             filepath: Destination file path
         """
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        temp_path = f"{filepath}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                FileManager._write_json(data, f)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            FileManager.remove_file(temp_path)
+            raise
+
+    @staticmethod
+    def _write_json(data: dict | Iterable, f: BinaryIO) -> None:
+        """Encode data as JSON into a binary file, as described in save_json."""
+        if not isinstance(data, dict):
+            separator = b"\n"
+            f.write(b"[")
+            for record in data:
+                f.write(separator)
+                f.write(FileManager.dumps(record))
+                separator = b",\n"
+            f.write(b"]\n" if separator == b"\n" else b"\n]\n")
+            return
+
+        # Dictionaries are small summaries meant to be read, so they always
+        # go through json, as orjson can only indent by 2
+        f.write(json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8"))
 
     @staticmethod
     def save_text(content: str, filepath: str) -> None:
@@ -56,6 +164,12 @@ class FileManager:
         """Check if a file exists."""
         return os.path.exists(filepath)
 
+    @staticmethod
+    def remove_file(filepath: str) -> None:
+        """Remove a file if it exists."""
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
     @staticmethod
     def get_file_size(filepath: str) -> int:
         """Get file size in bytes."""
@@ -1,11 +1,33 @@
 """LLM API client for Reddit Market Research Framework."""
 
+import hashlib
+import os
+import random
 import requests
-import time
 import json
+import threading
+import time
+from collections.abc import Iterator
+from requests.adapters import HTTPAdapter
 
+from utils.file_manager import FileManager
+from utils.rate_limiter import RateLimiter
 from utils.settings import Settings
 
+# Responses worth retrying: rate limiting and transient server errors
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Dropped connections and timeouts are transient too
+_RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+_BACKOFF_BASE_SECONDS = 1
+_BACKOFF_MAX_SECONDS = 32
+
+
+class LLMStreamError(Exception):
+    """Raised when a streamed LLM response breaks off part way through."""
+
 
 class LLMClient:
     """Handles communication with LLM APIs."""
@@ -16,6 +38,38 @@ class LLMClient:
         if not self.settings.openrouter_api_key:
             raise ValueError("OPENROUTER_API_KEY not found in settings.")
 
+        # One session for every call, so requests reuse pooled keep-alive
+        # connections instead of paying a TLS handshake each time
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = (
+            f"Bearer {self.settings.openrouter_api_key}"
+        )
+        # Request bodies are encoded by FileManager.dumps, which uses orjson
+        # when it is installed, instead of by requests' stdlib json
+        self.session.headers["Content-Type"] = "application/json"
+        # The filter and analysis stages each run LLM_WORKERS requests at
+        # once; size the pool so every one of them keeps its connection alive
+        # instead of overflowing the default of 10
+        adapter = HTTPAdapter(pool_maxsize=max(10, 2 * self.settings.llm_workers))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Requests from all worker threads are admitted at a steady rate of
+        # one per RATE_LIMIT_DELAY seconds, rather than each worker sleeping
+        # after its own calls
+        delay = self.settings.rate_limit_delay
+        self.rate_limiter = RateLimiter(1 / delay if delay > 0 else 0)
+
+        # Responses are kept on disk by a hash of the request, so a rerun
+        # after a crash or config tweak gets identical prompts back for free
+        self.cache_dir = None
+        if self.settings.llm_cache:
+            self.cache_dir = self.settings.llm_cache_dir
+
+    def close(self) -> None:
+        """Close the session and its pooled connections."""
+        self.session.close()
+
     def call_api(
         self,
         messages: list[dict],
@@ -38,33 +92,280 @@ class LLMClient:
         if timeout is None:
             timeout = self.settings.api_timeout
 
-        headers = {"Authorization": f"Bearer {self.settings.openrouter_api_key}"}
         data = {"model": model, "messages": messages}
 
         if response_format == "json_object":
             data["response_format"] = {"type": "json_object"}
 
+        # A JSON-mode reply that does not decode is never served from the
+        # cache, or it would come back on every rerun
+        json_mode = response_format == "json_object"
+        cache_key = None
+        if self.cache_dir is not None:
+            cache_key = self.cache_key(messages, model, data.get("response_format"))
+            cached = self.read_cache(cache_key)
+            if cached is not None and (not json_mode or self.is_json(cached)):
+                return cached
+
+        retries = self.settings.llm_max_retries
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.post(
+                    self.settings.openrouter_api_url,
+                    data=FileManager.dumps(data),
+                    timeout=timeout,
+                )
+                response.raise_for_status()
+                body = FileManager.loads(response.content)
+                content = body["choices"][0]["message"]["content"]
+                if (
+                    cache_key is not None
+                    and content
+                    and (not json_mode or self.is_json(content))
+                ):
+                    self.write_cache(cache_key, content)
+                return content
+
+            except requests.exceptions.RequestException as e:
+                if not self.wait_before_retry(e, attempt):
+                    return None
+
+            except (KeyError, IndexError, TypeError, ValueError):
+                print("Unexpected API response format")
+                return None
+
+    def wait_before_retry(
+        self, error: requests.exceptions.RequestException, attempt: int
+    ) -> bool:
+        """
+        Decide whether a failed request is worth another attempt and, if so,
+        wait before making it.
+
+        Rate limiting, transient server errors, dropped connections and
+        timeouts are retried up to LLM_MAX_RETRIES times.
+
+        Args:
+            error: Exception raised by the failed request
+            attempt: Zero-based number of the attempt that failed
+
+        Returns:
+            True if the request should be sent again, False to give up
+        """
+        print(f"API Request failed: {error}")
+        retries = self.settings.llm_max_retries
+        response = getattr(error, "response", None)
+        # A Response is falsy for error statuses, so compare against None
+        status = response.status_code if response is not None else None
+        if attempt >= retries or not (
+            status in _RETRY_STATUSES or isinstance(error, _RETRY_EXCEPTIONS)
+        ):
+            return False
+
+        # Wait as long as the server asks, else back off exponentially
+        delay = None
+        if response is not None:
+            delay = self.retry_after(response)
+        if delay is None:
+            delay = self.backoff_delay(attempt)
+        print(f"Retrying in {delay:.1f}s (attempt {attempt + 2}/{retries + 1})...")
+        if status == 429:
+            # Every worker backs off, not just the one that hit the limit
+            self.rate_limiter.pause(delay)
+        else:
+            time.sleep(delay)
+        return True
+
+    def call_api_stream(
+        self, messages: list[dict], model: str, timeout: float | None = None
+    ) -> Iterator[str]:
+        """
+        Send a request to the OpenRouter API and yield the reply as it is
+        generated, for long free-text responses.
+
+        Args:
+            messages: List of message dictionaries for the conversation
+            model: Model name to use
+            timeout: Optional timeout override, applied between chunks
+
+        Yields:
+            Pieces of the response content; nothing if the request failed
+
+        Raises:
+            LLMStreamError: If the response breaks off after some content was
+                yielded, since the caller then holds an incomplete reply
+        """
+        if timeout is None:
+            timeout = self.settings.api_timeout
+
+        cache_key = None
+        if self.cache_dir is not None:
+            cache_key = self.cache_key(messages, model, None)
+            cached = self.read_cache(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        data = {"model": model, "messages": messages, "stream": True}
+
+        # The request is retried like call_api's until the first content
+        # arrives; after that a failure can only be reported to the caller
+        content_parts = []
+        for attempt in range(self.settings.llm_max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with self.session.post(
+                    self.settings.openrouter_api_url,
+                    data=FileManager.dumps(data),
+                    timeout=timeout,
+                    stream=True,
+                ) as response:
+                    response.raise_for_status()
+                    # Server-sent events: "data: {...}" lines until
+                    # "data: [DONE]"; other lines are keep-alive comments
+                    for line in response.iter_lines():
+                        if not line.startswith(b"data: "):
+                            continue
+                        payload = line[len(b"data: ") :]
+                        if payload == b"[DONE]":
+                            break
+                        event = FileManager.loads(payload)
+                        if "error" in event:
+                            raise LLMStreamError(
+                                f"API stream failed: {event['error']}"
+                            )
+                        content = event["choices"][0]["delta"].get("content")
+                        if content:
+                            content_parts.append(content)
+                            yield content
+                    else:
+                        raise LLMStreamError("API stream ended before [DONE]")
+                break
+
+            except requests.exceptions.RequestException as e:
+                if content_parts:
+                    raise LLMStreamError(f"API stream interrupted: {e}") from e
+                if not self.wait_before_retry(e, attempt):
+                    return
+
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                if content_parts:
+                    raise LLMStreamError("Unexpected API response format") from e
+                print("Unexpected API response format")
+                return
+
+            except LLMStreamError as e:
+                if content_parts:
+                    raise
+                print(e)
+                return
+
+        if cache_key is not None and content_parts:
+            self.write_cache(cache_key, "".join(content_parts))
+
+    @staticmethod
+    def cache_key(messages: list[dict], model: str, response_format) -> str:
+        """
+        Hash everything that determines a response into a cache key.
+
+        Args:
+            messages: List of message dictionaries for the conversation
+            model: Model name
+            response_format: Response format sent with the request, if any
+
+        Returns:
+            Hex digest identifying the request
+        """
+        request = json.dumps(
+            [model, messages, response_format], sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def read_cache(self, key: str) -> str | None:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from cache_key
+
+        Returns:
+            Cached response content or None if not cached
+        """
         try:
-            response = requests.post(
-                self.settings.openrouter_api_url,
-                headers=headers,
-                json=data,
-                timeout=timeout,
-            )
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
-
-        except requests.exceptions.RequestException as e:
-            print(f"API Request failed: {e}")
-            if hasattr(e, "response") and e.response and e.response.status_code == 429:
-                print("Rate limit hit. Waiting...")
-                time.sleep(60)
+            with open(os.path.join(self.cache_dir, key), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
             return None
 
-        except (KeyError, IndexError):
-            print("Unexpected API response format")
+    def write_cache(self, key: str, content: str) -> None:
+        """
+        Store a response in the cache.
+
+        The entry is written to a temporary file and moved into place, so an
+        interrupted run never leaves a truncated response behind.
+
+        Args:
+            key: Cache key from cache_key
+            content: Response content to store
+        """
+        path = os.path.join(self.cache_dir, key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not cache LLM response: {e}")
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> float | None:
+        """
+        Read how long the server asked us to wait before retrying.
+
+        Args:
+            response: Failed HTTP response
+
+        Returns:
+            Seconds to wait, or None if the response does not say
+        """
+        try:
+            return max(float(response.headers["Retry-After"]), 0)
+        except (KeyError, TypeError, ValueError):
             return None
 
+    @staticmethod
+    def backoff_delay(attempt: int) -> float:
+        """
+        Exponential backoff with jitter, so workers that failed together do
+        not all retry at the same moment.
+
+        Args:
+            attempt: Number of the attempt that just failed, from 0
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def is_json(text: str) -> bool:
+        """
+        Check whether text is a decodable JSON document.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            True if the text decodes as JSON
+        """
+        try:
+            FileManager.loads(text)
+        except ValueError:
+            return False
+        return True
+
     def call_with_json_response(
         self, messages: list[dict], model: str, timeout: float | None = None
     ) -> dict | None:
@@ -80,7 +381,7 @@ class LLMClient:
 
         if response_str:
             try:
-                return json.loads(response_str)
+                return FileManager.loads(response_str)
             except json.JSONDecodeError:
                 print("Failed to decode JSON from LLM response.")
                 return {
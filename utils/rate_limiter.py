@@ -0,0 +1,64 @@
+"""Request rate limiting for Reddit Market Research Framework."""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket shared by worker threads to cap their combined request rate."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Requests allowed per second; 0 or less disables limiting
+            burst: Requests that may be made back to back after an idle period
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller may make its next request."""
+        # Reserve a token under the lock and sleep outside it. The balance may
+        # go negative; each caller then waits for its own place in the queue.
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._resume_at)
+            if self.rate > 0:
+                self._tokens = min(
+                    self.burst, self._tokens + (start - self._updated) * self.rate
+                )
+                self._updated = start
+                self._tokens -= 1
+                if self._tokens < 0:
+                    start -= self._tokens / self.rate
+            wait = start - now
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller for a while, e.g. when the server asks
+        clients to back off, even if limiting is otherwise disabled.
+
+        Args:
+            seconds: How long from now no requests may be made
+        """
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the allowed request rate, e.g. from server-reported limits.
+
+        Args:
+            rate: Requests allowed per second; 0 or less disables limiting
+        """
+        with self._lock:
+            self.rate = rate
@@ -37,23 +37,47 @@ class Settings:
         self.max_tokens_for_analysis = int(
             os.getenv("MAX_TOKENS_FOR_ANALYSIS", "16000")
         )
+        self.keyword_filter_min_matches = int(
+            os.getenv("KEYWORD_FILTER_MIN_MATCHES", "0")
+        )
+        self.keyword_filter_accept_matches = int(
+            os.getenv("KEYWORD_FILTER_ACCEPT_MATCHES", "0")
+        )
 
         # API settings
         self.api_timeout = int(os.getenv("API_TIMEOUT", "180"))
         self.rate_limit_delay = float(os.getenv("RATE_LIMIT_DELAY", "0.5"))
+        self.llm_max_retries = int(os.getenv("LLM_MAX_RETRIES", "5"))
         self.progress_save_interval = int(os.getenv("PROGRESS_SAVE_INTERVAL", "5"))
+        self.llm_workers = int(os.getenv("LLM_WORKERS", "4"))
+        if self.llm_workers < 1:
+            raise ValueError("LLM_WORKERS must be at least 1")
+        self.filter_batch_size = int(os.getenv("FILTER_BATCH_SIZE", "1"))
+        self.filter_batch_max_tokens = int(
+            os.getenv("FILTER_BATCH_MAX_TOKENS", "4000")
+        )
+        self.thematic_batch_max_tokens = int(
+            os.getenv("THEMATIC_BATCH_MAX_TOKENS", "8000")
+        )
+        self.llm_cache = os.getenv("LLM_CACHE", "true").lower() in ("1", "true", "yes")
 
         # Reddit request settings
         self.reddit_request_delay = float(os.getenv("REDDIT_REQUEST_DELAY", "0.25"))
         self.reddit_more_comments_limit = int(
             os.getenv("REDDIT_MORE_COMMENTS_LIMIT", "10")
         )
+        self.fetch_workers = int(os.getenv("FETCH_WORKERS", "4"))
+        if self.fetch_workers < 1:
+            raise ValueError("FETCH_WORKERS must be at least 1")
 
         # Paths
         self.output_dir = os.getenv("OUTPUT_DIR", "output")
         self.config_dir = os.getenv("CONFIG_DIR", "configs")
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(self.config_dir, exist_ok=True)
+        self.llm_cache_dir = os.getenv(
+            "LLM_CACHE_DIR", os.path.join(self.output_dir, ".llm_cache")
+        )
 
     def validate_required_settings(self) -> bool:
         """Validate that all required settings are present."""
@@ -1,6 +1,78 @@
 """Text processing utilities for Reddit Market Research Framework."""
 
 import re
+import threading
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a length heuristic
+    tiktoken = None
+
+# Inline markdown tokens fused into a single alternation so they are removed
+# in one pass. Every branch starts with a literal, which lets the regex engine
+# skip ahead to candidate characters; the named groups hold the text to keep.
+_RE_MARKDOWN_INLINE = re.compile(
+    r"```[\s\S]*?```"  # Code blocks
+    r"|    .*$"  # Indented code
+    # Links [text](url). Neither part may contain its own brackets or a
+    # line break, so a failed match never rescans past the next "[" or "("
+    r"|\[(?P<link>[^\[\]\n]+)\]\([^()\s]+\)"
+    r"|\*\*\*(?P<bold_italic>.*?)\*\*\*"  # Before bold, which would keep a "*"
+    r"|\*\*(?P<bold>.*?)\*\*"
+    r"|\*(?P<italic>[^*\n]*)\*"
+    r"|~~(?P<strikethrough>.*?)~~"
+    r"|`(?P<inline_code>[^`\n]*)`",
+    re.MULTILINE,
+)
+
+# Line-level markdown tokens: quotes, headers, horizontal rules, bullets and
+# numbering, removed together in a second pass. Leading whitespace is limited
+# to spaces and tabs so a match can never run on into the following lines;
+# otherwise long runs of blank lines make matching quadratic.
+_RE_MARKDOWN_LINE = re.compile(
+    r"^(?:(?:>|&gt;).*$|#{1,6}[ \t]*|[-*_]{3,}$|[ \t]*[\*\-\+]\s+|[ \t]*\d+\.\s+)",
+    re.MULTILINE,
+)
+
+# Quick checks for text that cannot contain any of the tokens above: none of
+# the characters a token starts with, no indented code and no numbered lines
+_RE_MARKDOWN_CHARS = re.compile(r"[`\[*~>&#\-_+]")
+_RE_NUMBERED_LINE = re.compile(r"^[ \t]*\d+\.", re.MULTILINE)
+
+# Whitespace normalization. Only runs that actually change are matched, so
+# ordinary single spaces between words are not replaced one by one.
+_RE_BLANK_LINES = re.compile(r"\n\s*\n")
+_RE_SPACES = re.compile(r"[ \t]{2,}|\t")
+
+
+# Tokenizer for estimate_token_count, loaded on first use since tiktoken may
+# need to download its vocabulary. False means it could not be loaded.
+_token_encoding = None
+_token_encoding_lock = threading.Lock()
+
+
+def _get_token_encoding():
+    """Return the shared tiktoken encoding, or None if it is unavailable."""
+    global _token_encoding
+    if _token_encoding is None:
+        with _token_encoding_lock:
+            if _token_encoding is None:
+                try:
+                    _token_encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    print(f"Could not load tiktoken encoding, estimating tokens: {e}")
+                    _token_encoding = False
+    return _token_encoding or None
+
+
+def _replace_inline_markdown(match: re.Match) -> str:
+    """Return the text to keep for a single inline markdown token."""
+    if match.lastgroup is None:
+        return ""
+    # Inline tokens may wrap other markdown, e.g. a link inside bold text
+    return _RE_MARKDOWN_INLINE.sub(
+        _replace_inline_markdown, match.group(match.lastgroup)
+    )
 
 
 class TextProcessor:
@@ -17,39 +89,27 @@ class TextProcessor:
         Returns:
             Plain text version
         """
-        if not text or text.strip() == "":
+        if not text or text.isspace():
             return text
 
-        # Remove Reddit quotes (lines starting with >)
-        text = re.sub(r"^&gt;.*$", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^>.*$", "", text, flags=re.MULTILINE)
-
-        # Remove markdown links [text](url)
-        text = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", text)
-
-        # Remove markdown emphasis
-        text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)  # Bold
-        text = re.sub(r"\*(.*?)\*", r"\1", text)  # Italic
-        text = re.sub(r"~~(.*?)~~", r"\1", text)  # Strikethrough
-        text = re.sub(r"`(.*?)`", r"\1", text)  # Inline code
-
-        # Remove code blocks
-        text = re.sub(r"```[\s\S]*?```", "", text)
-        text = re.sub(r"    .*$", "", text, flags=re.MULTILINE)  # Indented code
-
-        # Remove headers
-        text = re.sub(r"^#{1,6}\s*", "", text, flags=re.MULTILINE)
-
-        # Remove horizontal rules
-        text = re.sub(r"^[-*_]{3,}$", "", text, flags=re.MULTILINE)
-
-        # Remove bullet points and numbering
-        text = re.sub(r"^\s*[\*\-\+]\s+", "", text, flags=re.MULTILINE)
-        text = re.sub(r"^\s*\d+\.\s+", "", text, flags=re.MULTILINE)
-
-        # Clean up extra whitespace
-        text = re.sub(r"\n\s*\n", "\n\n", text)  # Multiple empty lines to double
-        text = re.sub(r"[ \t]+", " ", text)  # Multiple spaces/tabs to single space
+        # Most titles and short comments have no markdown at all and only
+        # need their whitespace cleaned up
+        if (
+            _RE_MARKDOWN_CHARS.search(text)
+            or "    " in text
+            or _RE_NUMBERED_LINE.search(text)
+        ):
+            # Remove code and unwrap links and emphasis
+            text = _RE_MARKDOWN_INLINE.sub(_replace_inline_markdown, text)
+
+            # Remove quotes, headers, horizontal rules, bullets and numbering
+            text = _RE_MARKDOWN_LINE.sub("", text)
+
+        # Clean up whitespace, skipping each pass when it has nothing to match
+        if text.count("\n") > 1:
+            text = _RE_BLANK_LINES.sub("\n\n", text)  # Empty lines to double
+        if "  " in text or "\t" in text:
+            text = _RE_SPACES.sub(" ", text)  # Multiple spaces/tabs to single space
         text = text.strip()
 
         return text
@@ -57,7 +117,8 @@ class TextProcessor:
     @staticmethod
     def estimate_token_count(text: str) -> int:
         """
-        Rough estimation of token count (approximately 4 characters per token).
+        Count tokens with tiktoken's cl100k_base encoding when it is
+        installed, otherwise estimate them at about 4 characters per token.
 
         Args:
             text: Text to estimate tokens for
@@ -65,4 +126,10 @@ class TextProcessor:
         Returns:
             Estimated token count
         """
-        return len(text) // 4 if text else 0
+        if not text:
+            return 0
+        if tiktoken is not None:
+            encoding = _get_token_encoding()
+            if encoding is not None:
+                return len(encoding.encode_ordinary(text))
+        return len(text) // 4